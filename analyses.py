@@ -0,0 +1,359 @@
+import functools
+import io
+import threading
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+
+from stats_utils import cramers_v_batch, fast_chi2_uniform
+
+ATTEMPT_COLUMNS = ['attempt_1', 'attempt_2', 'attempt_3']
+TABLE_PREVIEW_ROWS = 500
+FIGURE_CACHE_ENTRIES = 16
+
+
+@functools.cache
+def _mpl_figure():
+    """matplotlib.figure, imported on first use so pages without charts skip it."""
+    import matplotlib.figure
+    return matplotlib.figure
+
+
+@functools.cache
+def _sns():
+    """seaborn, imported on first use for its color palettes."""
+    import seaborn as sns
+    return sns
+
+
+@st.cache_data(show_spinner=False)
+def load_csv(raw: bytes) -> pd.DataFrame:
+    """Parse the uploaded CSV and reshape it to one row per attempt.
+
+    Keyed on the raw upload bytes so reruns reuse the parsed frame.
+    """
+    # Only parse the columns the analyses use, with the multithreaded Arrow reader
+    data_raw = pd.read_csv(
+        io.BytesIO(raw),
+        usecols=['user_id', 'object', *ATTEMPT_COLUMNS],
+        dtype={'user_id': 'category', 'object': 'category'},
+        engine='pyarrow'
+    )
+
+    # Reshape the data to long format
+    data = data_raw.melt(
+        id_vars=['user_id', 'object'],
+        value_vars=ATTEMPT_COLUMNS,
+        var_name='attempt',
+        value_name='selected_color_space'
+    )
+
+    # Map attempt names to numeric values
+    data['attempt'] = data['attempt'].str.extract(r'(\d+)').astype(int)
+
+    # Low-cardinality keys are grouped on repeatedly, so store them as categories
+    for col in ('selected_color_space', 'object', 'user_id'):
+        if col in data:
+            data[col] = data[col].astype('category')
+    return data
+
+
+@st.cache_data(show_spinner=False)
+def compute_color_code_counts(raw: bytes) -> np.ndarray:
+    """Total selections per color format, ordered by category code."""
+    formats = load_csv(raw)['selected_color_space'].cat
+    codes = formats.codes.to_numpy()
+    # Missing selections have code -1 and are not counted
+    return np.bincount(codes[codes >= 0], minlength=len(formats.categories))
+
+
+@st.cache_data(show_spinner=False)
+def compute_color_counts(raw: bytes) -> pd.Series:
+    """Total selections per color format, most selected first, for display."""
+    formats = load_csv(raw)['selected_color_space'].cat
+    counts = pd.Series(
+        compute_color_code_counts(raw),
+        index=formats.categories.rename('selected_color_space'),
+        name='count'
+    )
+    return counts.sort_values(ascending=False, kind='stable')
+
+
+@st.cache_data(show_spinner=False)
+def compute_object_color(raw: bytes) -> pd.DataFrame:
+    """Selections per object (rows) and color format (columns)."""
+    data = load_csv(raw)
+    objects = data['object'].cat
+    formats = data['selected_color_space'].cat
+    object_codes = objects.codes.to_numpy()
+    format_codes = formats.codes.to_numpy()
+
+    # Count (object, format) code pairs in one pass, skipping missing values (code -1)
+    n_objects, n_formats = len(objects.categories), len(formats.categories)
+    valid = (object_codes >= 0) & (format_codes >= 0)
+    pair_codes = object_codes[valid].astype(np.int64) * n_formats + format_codes[valid]
+    counts = np.bincount(pair_codes, minlength=n_objects * n_formats).reshape(n_objects, n_formats)
+    return pd.DataFrame(
+        counts,
+        index=objects.categories.rename('object'),
+        columns=formats.categories.rename('selected_color_space')
+    )
+
+
+@st.cache_data(show_spinner=False)
+def compute_consistency(raw: bytes) -> pd.Series:
+    """Whether each participant picked a single color format for an object across repeats."""
+    data = load_csv(raw)
+    # Missing attempts count as a value of their own, as len(set(x)) == 1 did: a pair
+    # with some attempts missing is inconsistent, one with all missing is consistent
+    return data.groupby(['user_id', 'object'], observed=True)['selected_color_space'].nunique(dropna=False).eq(1)
+
+
+@st.cache_data(show_spinner=False)
+def compute_user_objects(raw: bytes) -> pd.DataFrame:
+    """Selections per participant and object, flagged for consistency across repeats."""
+    data = load_csv(raw)
+    # Group by 'user_id', 'object' and get list of selected color spaces. apply
+    # rather than agg: pandas 3 casts agg results back to the categorical dtype,
+    # which fails on lists.
+    user_objects = data.groupby(['user_id', 'object'], observed=True)['selected_color_space'].apply(list).to_frame()
+    # Align the flag on the (user_id, object) key rather than on row order
+    user_objects['consistent'] = compute_consistency(raw)
+    return user_objects.reset_index()
+
+
+@st.cache_data(show_spinner=False)
+def compute_user_objects_csv(raw: bytes) -> bytes:
+    """The full participant consistency table encoded as CSV for download."""
+    return compute_user_objects(raw).to_csv(index=False).encode('utf-8')
+
+
+@st.cache_resource(show_spinner=False)
+def _figure_lock() -> threading.Lock:
+    """Lock shared by every session, held while a cached figure is rendered."""
+    return threading.Lock()
+
+
+def show_figure(fig):
+    """Render a cached figure; Matplotlib is not thread-safe and these are shared."""
+    with _figure_lock():
+        st.pyplot(fig)
+
+
+# The builders below create figures with Figure() rather than pyplot, so cached
+# figures are never registered with pyplot's global figure manager.
+@st.cache_resource(show_spinner=False, max_entries=FIGURE_CACHE_ENTRIES)
+def make_selection_pie(labels: tuple, values: tuple):
+    """Pie chart of each color format's share of all selections."""
+    fig = _mpl_figure().Figure()
+    ax = fig.subplots()
+    ax.pie(
+        values,
+        labels=labels,
+        autopct='%1.1f%%',
+        startangle=90,
+        colors=_sns().color_palette('Set2', len(values))
+    )
+    ax.axis('equal')
+    ax.set_title('Percentage of Selections by Color Format')
+    return fig
+
+
+@st.cache_resource(show_spinner=False, max_entries=FIGURE_CACHE_ENTRIES)
+def make_consistency_pie(sizes: tuple):
+    """Pie chart of consistent vs. inconsistent participant/object pairs."""
+    fig = _mpl_figure().Figure()
+    ax = fig.subplots()
+    labels = ['Consistent', 'Inconsistent']
+    ax.pie(sizes, labels=labels, autopct='%1.1f%%', startangle=90, colors=['#66b3ff', '#ff9999'])
+    ax.axis('equal')
+    return fig
+
+
+@st.cache_resource(show_spinner=False, max_entries=FIGURE_CACHE_ENTRIES)
+def make_heatmap(counts_bytes: bytes, index: tuple, columns: tuple):
+    """Annotated heatmap of selections per object (rows) and color format (columns)."""
+    counts = np.frombuffer(counts_bytes, dtype=np.int64).reshape(len(index), len(columns))
+    fig = _mpl_figure().Figure(figsize=(10, 8))
+    ax = fig.subplots()
+    image = ax.imshow(counts, cmap='Blues', aspect='auto')
+    fig.colorbar(image, ax=ax)
+    ax.set_xticks(range(len(columns)), columns)
+    ax.set_yticks(range(len(index)), index)
+
+    # Light text on dark cells, as seaborn's annotated heatmap does
+    threshold = counts.max() / 2 if counts.size else 0
+    for i, j in np.ndindex(counts.shape):
+        ax.text(j, i, str(counts[i, j]), ha='center', va='center',
+                color='white' if counts[i, j] > threshold else 'black')
+
+    ax.set_xlabel('Color Format')
+    ax.set_ylabel('Object')
+    ax.set_title('Heatmap of Color Format Selection by Object')
+    return fig
+
+
+def run_analysis_1(raw: bytes):
+    """Analysis 1: total selections per color format."""
+    color_counts = compute_color_counts(raw)
+
+    st.header("Analysis 1: Frequency of Selections for Each Color Format")
+    st.subheader("Total Selections by Color Format")
+
+    # Explanation
+    st.write("""
+    This chart shows the number of times each color format (CMYK, Pantone, RGB) was selected by participants across all tasks. It helps identify which color formats are generally preferred.
+    """)
+
+    # Native chart, so no Matplotlib figure is created for this view
+    st.caption('Frequency of Selections for Each Color Format')
+    st.bar_chart(color_counts.rename('Number of Selections').rename_axis('Color Format'))
+
+
+def run_analysis_2(raw: bytes):
+    """Analysis 2: each color format's share of all selections."""
+    color_counts = compute_color_counts(raw)
+
+    st.header("Analysis 2: Preferred Color Formats Across Participants")
+    color_percentages = color_counts / color_counts.sum() * 100
+    st.subheader("Percentage of Selections by Color Format")
+
+    # Explanation
+    st.write("""
+    This table and pie chart display the percentage of total selections that each color format received. This indicates the relative popularity of each color format among all participants.
+    """)
+
+    st.dataframe(color_percentages.to_frame(name='Percentage (%)'))
+
+    fig2 = make_selection_pie(tuple(color_counts.index), tuple(color_counts.tolist()))
+    show_figure(fig2)
+
+
+def run_analysis_3(raw: bytes):
+    """Analysis 3: selections per object and color format."""
+    object_color = compute_object_color(raw)
+
+    st.header("Analysis 3: Preferred Color Formats by Object")
+    st.subheader("Selections per Object and Color Format")
+
+    # Explanation
+    st.write("""
+    This table and heatmap show how often each color format was selected for each object. It helps determine if certain objects have a preferred color format, indicating the importance of color accuracy for specific objects.
+    """)
+
+    st.dataframe(object_color)
+
+    if st.checkbox("Show Heatmap"):
+        fig3 = make_heatmap(
+            object_color.to_numpy(dtype=np.int64).tobytes(),
+            tuple(object_color.index),
+            tuple(object_color.columns)
+        )
+        show_figure(fig3)
+
+
+def run_analysis_4(raw: bytes):
+    """Analysis 4: chi-squared tests overall and per object."""
+    color_code_counts = compute_color_code_counts(raw)
+    object_color = compute_object_color(raw)
+
+    st.header("Analysis 4: Statistical Significance Testing")
+    st.subheader("Chi-Squared Test for Overall Color Format Preferences")
+
+    # Explanation
+    st.write("""
+    The chi-squared test determines whether there is a statistically significant difference in the frequency of selections among color formats. A significant result suggests that participants have a preference for certain color formats.
+    """)
+
+    n_selections = int(color_code_counts.sum())
+    if len(color_code_counts) > 1 and n_selections > 0:
+        chi2_stat, p_value = map(float, fast_chi2_uniform(color_code_counts))
+        cramer_v_value = float(cramers_v_batch(chi2_stat, n_selections, 1, len(color_code_counts)))
+        st.write(f"Chi-squared Statistic: {chi2_stat:.2f}")
+        st.write(f"P-value: {p_value:.4f}")
+        st.write(f"Cramér's V (Effect Size): {cramer_v_value:.4f}")
+        if p_value < 0.05:
+            st.success("The differences in color format selections are statistically significant (p < 0.05).")
+        else:
+            st.info("The differences in color format selections are not statistically significant (p ≥ 0.05).")
+    else:
+        st.write("Not enough categories or data for chi-squared test.")
+
+    # Chi-Squared Test for each object
+    st.subheader("Chi-Squared Test for Color Preferences by Object")
+
+    # Explanation
+    st.write("""
+    This test examines whether the selection frequencies of color formats differ significantly for each object. It helps identify objects where color format preferences are especially pronounced.
+    """)
+
+    if st.checkbox("Show Per-Object Tests"):
+        # Each object is a 1 x k test against a uniform split of its selections,
+        # so all rows are evaluated at once on the full table. Work on the raw
+        # ndarray and positions; labels are only needed for the output.
+        observed = object_color.to_numpy()
+        objects = object_color.index.to_numpy()
+        totals = observed.sum(axis=1)
+        n_formats = observed.shape[1]
+        testable = (n_formats > 1) & (totals > 0) & (observed > 0).all(axis=1)
+        object_chi2, object_p = fast_chi2_uniform(observed)
+        object_v = cramers_v_batch(object_chi2, totals, 1, n_formats)
+
+        # Render all objects as one table rather than a block of messages per object
+        significant = testable & (object_p < 0.05)
+        results = pd.DataFrame({
+            'Chi-squared Statistic': np.where(testable, object_chi2, np.nan),
+            'P-value': np.where(testable, object_p, np.nan),
+            "Cramér's V (Effect Size)": np.where(testable, object_v, np.nan),
+            'Significant (p < 0.05)': significant,
+        }, index=object_color.index.rename('Object'))
+        st.dataframe(results, use_container_width=True)
+
+        n_tested = int(testable.sum())
+        n_significant = int(significant.sum())
+        if n_significant > 0:
+            st.success(f"For {n_significant} of {n_tested} tested objects, the differences in color format selections are statistically significant (p < 0.05).")
+        elif n_tested > 0:
+            st.info(f"For none of the {n_tested} tested objects are the differences in color format selections statistically significant (p ≥ 0.05).")
+        if not testable.all():
+            untested = ', '.join(map(str, objects[~testable]))
+            st.write(f"Not enough data or categories for chi-squared test, or zero counts present: {untested}")
+
+
+def run_consistency_analysis(raw: bytes):
+    """Additional analysis: participant consistency over repeats."""
+    consistent = compute_consistency(raw)
+
+    st.header("Additional Analysis: Participant Consistency Over Repeats")
+
+    # Explanation
+    st.write("""
+    This analysis checks whether participants consistently selected the same color format for the same object across different repeats. A higher consistency rate suggests strong preferences or perceptions regarding color formats for specific objects.
+    """)
+
+    st.subheader("Participant Consistency Data")
+    if st.checkbox("Show Participant Consistency Table"):
+        # Large studies only preview in the browser; the full table is a download
+        user_objects = compute_user_objects(raw)
+        if len(user_objects) > TABLE_PREVIEW_ROWS:
+            st.write(f"Showing the first {TABLE_PREVIEW_ROWS} of {len(user_objects)} rows.")
+        st.dataframe(user_objects.head(TABLE_PREVIEW_ROWS), use_container_width=True)
+        st.download_button(
+            "Download Full Table as CSV",
+            data=compute_user_objects_csv(raw),
+            file_name='participant_consistency.csv',
+            mime='text/csv'
+        )
+
+    # Reduce the flags once and derive the rate and pie slices from the scalars
+    n_consistent = int(consistent.sum())
+    n_total = len(consistent)
+    consistency_rate = n_consistent / n_total * 100 if n_total else float('nan')
+    st.write(f"Overall Consistency Rate: {consistency_rate:.2f}%")
+
+    # Plotting consistency
+    st.subheader("Consistency Rate Visualization")
+    sizes = (n_consistent, n_total - n_consistent)
+    fig4 = make_consistency_pie(sizes)
+    show_figure(fig4)
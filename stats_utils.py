@@ -0,0 +1,34 @@
+import numpy as np
+from scipy.stats import chi2 as chi2_dist
+
+
+def fast_chi2_uniform(observed: np.ndarray):
+    """Chi-squared test of counts against a uniform split, in closed form.
+
+    Works along the last axis, so each row of a 2-D array is tested
+    independently. Returns the statistics and their p-values.
+    """
+    observed = np.asarray(observed, dtype=np.float64)
+    k = observed.shape[-1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        expected = observed.sum(axis=-1, keepdims=True) / k
+        chi2 = ((observed - expected) ** 2 / expected).sum(axis=-1)
+    return chi2, chi2_dist.sf(chi2, k - 1)
+
+
+def cramers_v_batch(chi2: np.ndarray, n: np.ndarray, r: int, k: int) -> np.ndarray:
+    """Bias-corrected Cramér's V for a batch of r x k tables.
+
+    ``chi2`` and ``n`` hold the chi-squared statistic and total count of each
+    table. One-way tables (r == 1) only apply the column correction.
+    """
+    chi2 = np.asarray(chi2, dtype=np.float64)
+    n = np.asarray(n, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        phi2 = chi2 / n
+        phi2corr = np.maximum(0, phi2 - ((k - 1) * (r - 1)) / (n - 1))
+        rcorr = r - ((r - 1) ** 2) / (n - 1)
+        kcorr = k - ((k - 1) ** 2) / (n - 1)
+        denom = kcorr - 1 if r == 1 else np.minimum(kcorr - 1, rcorr - 1)
+        v = np.sqrt(phi2corr / denom)
+    return np.where(np.isfinite(v), v, 0.0)